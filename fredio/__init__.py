@@ -1,11 +1,15 @@
-__all__ = ["configure", "shutdown", "client", "events"]
+__all__ = ["configure", "shutdown", "ashutdown", "client", "events"]
 
 import atexit
+import logging
 from typing import Optional
 
 from . import client, events, utils
 
 
+logger = logging.getLogger(__name__)
+
+
 def configure(api_key: Optional[str] = None,
               rate_limit: Optional[int] = None,
               enable_events: bool = False,
@@ -31,12 +35,29 @@ def configure(api_key: Optional[str] = None,
     return client_
 
 
+async def ashutdown():
+    """
+    Flush and cancel the events consumer, and close the sessions of cached clients
+    """
+    await events.cancel()
+
+    for client_ in client._clients.values():
+        await client_.aclose()
+
+    await client._wait_closed()
+
+
 def shutdown():
     """
-    Shutdown events consumer on exit
+    Shutdown on exit. This is a no-op if the event loop is closed or running.
     """
-    # Flush all events and cancel
-    utils.loop.run_until_complete(events.cancel())
+    if utils.loop.is_closed() or utils.loop.is_running():
+        return
+
+    try:
+        utils.loop.run_until_complete(ashutdown())
+    except RuntimeError as e:
+        logger.exception(e)
 
 
 atexit.register(shutdown)
@@ -1,14 +1,27 @@
-__all__ = ["ApiClient", "get_api_key", "get_client"]
+__all__ = ["ApiClient", "get_api_key", "get_client", "get_connector"]
 
 import asyncio
+import collections
 import itertools
 import logging
 import os
-import webbrowser
-from datetime import datetime
-from typing import Optional, Type, TYPE_CHECKING
-
-from aiohttp import ClientSession, ClientResponse, ClientResponseError
+import sys
+import types
+from email.utils import parsedate_to_datetime
+from typing import (Any,
+                    AsyncGenerator,
+                    AsyncIterator,
+                    Awaitable,
+                    Callable,
+                    Dict,
+                    List,
+                    Mapping,
+                    Optional,
+                    Set,
+                    Type,
+                    TYPE_CHECKING)
+
+from aiohttp import ClientSession, ClientResponse, ClientResponseError, TCPConnector
 from yarl import URL
 
 from . import const
@@ -22,66 +35,79 @@ if TYPE_CHECKING:
 
 logger = logging.getLogger(__name__)
 
+# Shared query engine used when none is passed to Endpoint.aget
+_default_engine = utils.JsonpathEngine()
+
 
 class ApiClient(object):
     """
     Lazy sync wrapper around aiohttp.ClientSession, also containing
     Endpoint objects that provide attribute access to URL subpaths.
     """
-    ratelimiter: locks.RateLimiter = locks.RateLimiter()
-
-    def __new__(cls, *args, **kwargs):
-        """
-        Intercept to add Endpoint attributes to the instance at runtime
-        """
-
-        instance = super().__new__(cls)
-
-        def setdefault(obj, key, value):
-
-            if not hasattr(obj, key):
-                setattr(obj, key, value)
-                return value
-            else:
-                return getattr(obj, key)
-
-        for ep in const.FRED_API_ENDPOINTS:
+    # __dict__ holds the Endpoint attributes
+    __slots__ = (
+        "_defaults", "_session_cls", "_session_kws", "_session",
+        "_max_concurrency", "_semaphore", "_pagination_hints", "__dict__"
+    )
 
-            iterobj = instance
-            for s in ep.split("/"):
-                iterobj = setdefault(iterobj, s, Endpoint(instance, ep))
-
-        return instance
+    ratelimiter: locks.RateLimiter = locks.RateLimiter()
 
     def __init__(self,
                  api_key: str,
                  *,
                  session_cls: Type[ClientSession] = ClientSession,
+                 max_concurrency: int = const.FRED_API_MAX_CONCURRENCY,
                  **session_kws):
         """
         :param api_key: FRED API key
-        :param session_kws: Keyword arguments passed to ClientSession
+        :param max_concurrency: Maximum number of requests in flight at once,
+        independent of the rate limit
+        :param session_kws: Keyword arguments passed to ClientSession. A connector
+        created by get_connector() is used unless one is provided here.
         """
 
         # Default HTTP parameters
         defaults = {"api_key": api_key, "file_type": "json"}
 
-        self._defaults = frozenset(defaults.items())
+        self._defaults: Mapping[str, str] = types.MappingProxyType(defaults)
 
         # Lazy instantiation to be called within an async function
         # ClientSession is cached
         self._session_cls = session_cls
-        self._session_kws = frozenset(session_kws.items())
+        self._session_kws: Dict[str, Any] = session_kws
         self._session: Optional[ClientSession] = None
 
+        # Lazy instantiation, for the same reason as the ClientSession
+        self._max_concurrency = max_concurrency
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+        # Offsets of remaining batches planned by the last request to a URL
+        self._pagination_hints: "collections.OrderedDict[URL, range]" = collections.OrderedDict()
+
+    def __getattr__(self, name: str) -> "Endpoint":
+        """
+        Create Endpoint attributes on first access
+        """
+        return _add_endpoint(self, self, "", name)
+
+    def __dir__(self):
+        return sorted(set(super().__dir__()) | _endpoint_tree[""].keys())
+
     def __enter__(self):
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
         self.close()
 
+    async def __aenter__(self):
+        self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.aclose()
+
     @property
-    def defaults(self):
+    def defaults(self) -> Mapping[str, str]:
         return self._defaults
 
     @property
@@ -89,6 +115,12 @@ class ApiClient(object):
         self.start()
         return self._session  # type: ignore
 
+    @property
+    def semaphore(self) -> asyncio.Semaphore:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self._max_concurrency)
+        return self._semaphore
+
     @classmethod
     def set_rate_limit(cls, limit: int = const.FRED_API_RATE_LIMIT):
         cls.ratelimiter = locks.RateLimiter(limit=limit)
@@ -98,32 +130,57 @@ class ApiClient(object):
         Initialize and cache the ClientSession instance
         """
         if self._session is None:
-            logger.debug("Initializing %s" % self._session_cls.__name__)
-            self._session = self._session_cls(**dict(self._session_kws))  # type: ignore
+            logger.debug("Initializing %s", self._session_cls.__name__)
 
-    def close(self) -> None:
+            session_kws = self._session_kws
+            if "connector" not in session_kws:
+                session_kws = dict(session_kws, connector=get_connector())
+
+            self._session = self._session_cls(**session_kws)  # type: ignore
+
+    async def aclose(self) -> None:
         """
         Close the ClientSession instance
         """
         if self._session is not None:
-            logger.debug("Closing %s" % self._session_cls.__name__)
-            utils.loop.run_until_complete(self._session.close())
+            logger.debug("Closing %s", self._session_cls.__name__)
+            session, self._session = self._session, None
+            await session.close()
+
+    def close(self) -> None:
+        """
+        Close the ClientSession instance. Blocks until complete, unless the loop
+        is already running in which case closing is scheduled as a task. Use
+        aclose() to wait for the session to close from a running loop.
+        """
+        if self._session is None:
+            return
 
+        if utils.loop.is_closed():
+            logger.debug("Event loop is closed, discarding %s", self._session_cls.__name__)
             self._session = None
+        elif utils.loop.is_running():
+            session, self._session = self._session, None
+            _schedule_close(session)
+        else:
+            utils.loop.run_until_complete(self.aclose())
 
-    async def _handle_exception(self,
-                                response: ClientResponse,
-                                exc: ClientResponseError) -> None:
+    def _get_retry_backoff(self,
+                           response: ClientResponse,
+                           exc: ClientResponseError) -> float:
+        """
+        Get the number of seconds to wait before retrying a failed request.
+        A Retry-After header given in seconds is used if present, otherwise the
+        backoff is computed from the response Date. Errors other than 429 are raised.
+        """
         if exc.status == 429:
-            hdr_time = datetime.strptime(
-                response.headers["Date"],
-                const.HEADER_DATE_FMT
-            )
+            retry_after = response.headers.get("Retry-After", "")
+            if retry_after.isdigit():
+                return float(retry_after)
 
-            backoff = self.ratelimiter.get_backoff(reltime=hdr_time.timestamp())
+            hdr_time = parsedate_to_datetime(response.headers["Date"])
 
-            logger.debug("Retrying request in %.2f seconds" % backoff)
-            await asyncio.sleep(backoff)
+            return self.ratelimiter.get_backoff(reltime=hdr_time.timestamp())
         else:
             raise exc
 
@@ -132,7 +189,10 @@ class ApiClient(object):
                       url: URL,
                       retries: int = 0) -> ClientResponse:
         """
-        Wraps ClientSession.request() with rate limiting and handles retry logic
+        Wraps ClientSession.request() with rate limiting and handles retry logic.
+        The number of requests in flight is bounded by a semaphore. Backoff between
+        retries happens after the rate limiter and the response have been released,
+        so concurrent requests are not blocked.
 
         :param method: Request method
         :param url: URL
@@ -140,14 +200,15 @@ class ApiClient(object):
         """
 
         while retries >= 0:
-            async with self.ratelimiter:
+            async with self.ratelimiter, self.semaphore:
                 async with self.session.request(method, url) as response:
-                    logger.debug("%s %s" % (method, url))
+                    logger.debug("%s %s", method, url)
                     try:
                         response.raise_for_status()
 
-                        # Read response data from the open connection before emitting an event
-                        # This can cause a race condition on the response buffer (or something)
+                        # Buffer the body while the connection is still open; it is released
+                        # when this context exits. response.json() reuses this buffer, so the
+                        # body is only read once whether or not events are running.
                         await response.read()
 
                         # Emit a response event with name corresponding to the final endpoint
@@ -158,59 +219,226 @@ class ApiClient(object):
                         return response
 
                     except ClientResponseError as e:
-                        logging.error(e)
+                        logger.error(e)
                         retries -= 1
-                        if retries >= 0:
-                            await self._handle_exception(response, e)
-                        else:
+                        if retries < 0:
                             raise
+                        backoff = self._get_retry_backoff(response, e)
+
+            logger.debug("Retrying request in %.2f seconds", backoff)
+            await asyncio.sleep(backoff)
 
         return  # type: ignore
 
-    async def get(self, url: URL, retries: int = 0) -> utils.JSON_T:
+    async def get(self,
+                  url: URL,
+                  retries: int = 0,
+                  count: Optional[int] = None,
+                  probe: bool = False) -> utils.JSON_T:
         """
         Will await a single request to get the first batch of data before executing
-        subsequent requests (if required) according to offset logic.
+        subsequent requests (if required) according to offset logic. Batches planned
+        by the last request to the same URL are requested along with the first.
+
+        If the total result count is known and the URL has a limit parameter, all
+        requests are executed concurrently without waiting for the first batch.
 
         :param url: URL
         :param retries: Retry count, passed to Session.request
+        :param count: Optional known total result count
+        :param probe: If the URL has a limit parameter and count is not known, get the
+        count from a minimal request (limit=1) rather than a full first batch
         """
 
-        # Helper
-        async def json(_url):
-            response = await self.request(url=_url, method="GET", retries=retries)
-            return await response.json()
+        json = self._batch_getter(url, retries)
 
-        results = [await json(url)]
+        if probe and count is None and "limit" in url.query:
+            probed = await self._batch_getter(url.update_query(limit=1), retries)()
+            count = probed.get("count", 0)  # type: ignore
 
-        count = results[0].get("count")
-        limit = results[0].get("limit")
-        offset = results[0].get("offset", 0)
+        if count is not None and "limit" in url.query:
+            limit = int(url.query["limit"])
+            offset = int(url.query.get("offset", 0))
 
-        if count or limit:
-            coros = list(map(
-                lambda x: json(url.update_query(offset=x)),  # type: ignore
-                range(limit + offset, count, limit)
-            ))
+            offsets = range(offset, max(count, offset + 1), limit)
 
             logger.debug(
-                "Planning %s additional requests (count: %d limit: %d offset: %d)"
-                % (len(coros), count, limit, offset)
+                "Planning %s requests (count: %d limit: %d offset: %d)",
+                len(offsets), count, limit, offset
             )
 
-            results.extend(await asyncio.gather(*coros))
+            return await self._gather_offsets(json, offsets)
+
+        # Pages planned by a previous request to this URL are requested speculatively,
+        # concurrently with the first batch. At most max_concurrency are started here,
+        # and any remaining pages are left to the workers of _gather_offsets.
+        hints = self._pagination_hints.get(url, range(0))[:self._max_concurrency]
+
+        first = asyncio.ensure_future(json())
+        prefetched = {x: asyncio.ensure_future(json(x)) for x in hints}
+
+        try:
+            results = [await first]
+        except BaseException:
+            for future in prefetched.values():
+                future.cancel()
+            raise
+
+        offsets = self._plan_offsets(url, results[0])
+
+        for x in prefetched.keys() - set(offsets):
+            prefetched[x].cancel()
+
+        if offsets:
+            results.extend(await self._gather_offsets(json, offsets, prefetched))
+
+        return results
+
+    async def iterget(self, url: URL, retries: int = 0) -> AsyncGenerator[utils.JSON_T, None]:
+        """
+        Asynchronous generator version of get(), yielding each batch of data as soon
+        as it is received. The first batch is yielded first, and subsequent batches
+        in order of completion rather than offset.
+
+        :param url: URL
+        :param retries: Retry count, passed to Session.request
+        """
+        get_batch = self._batch_getter(url, retries)
+
+        first = await get_batch()
+        yield first
+
+        offsets = self._plan_offsets(url, first)
+        if not offsets:
+            return
+
+        received: asyncio.Queue = asyncio.Queue()
+
+        async def fetch(offset):
+            try:
+                received.put_nowait(await get_batch(offset))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                received.put_nowait(e)
+
+        task = asyncio.ensure_future(self._gather_offsets(fetch, offsets))
+
+        try:
+            for _ in offsets:
+                batch = await received.get()
+                if isinstance(batch, Exception):
+                    raise batch
+                yield batch
+        finally:
+            task.cancel()
+
+    def _batch_getter(self, url: URL, retries: int) -> Callable[..., Awaitable]:
+        """
+        Get a coroutine function requesting the batch of data at an optional offset
+        of a URL. URLs with an offset are formatted from the encoded URL string, rather
+        than encoding the full query again for every batch. Large response bodies are
+        decoded in the default executor so that other requests keep progressing.
+
+        :param url: URL
+        :param retries: Retry count, passed to Session.request
+        """
+        offset_url = _offset_url_template(url)
+
+        async def get_batch(offset: Optional[int] = None) -> utils.JSON_T:
+            _url = url if offset is None else URL(offset_url % offset, encoded=True)
+            response = await self.request(url=_url, method="GET", retries=retries)
+            body = await response.read()
+
+            data: utils.JSON_T
+            if len(body) < const.JSON_EXECUTOR_MINSIZE:
+                data = utils.json_loads(body)
+            else:
+                loop = asyncio.get_event_loop()
+                data = await loop.run_in_executor(None, utils.json_loads, body)
+            return data
+
+        return get_batch
+
+    async def _gather_offsets(self,
+                              fetch: Callable[[int], Awaitable],
+                              offsets: range,
+                              prefetched: Optional[Mapping[int, asyncio.Future]] = None) -> List:
+        """
+        Fetch batches at each offset using a fixed pool of workers, such that the number
+        of pending coroutines is bounded by max_concurrency rather than the number of
+        batches. Results are returned in offset order.
+
+        :param fetch: Coroutine function fetching the batch at an offset
+        :param offsets: Batch offsets
+        :param prefetched: Futures of batches that have already been requested
+        """
+        prefetched = prefetched or {}
+        results: List = [None] * len(offsets)
+
+        # Workers share a single iterator of jobs
+        jobs = iter(enumerate(offsets))
+
+        async def worker():
+            for i, x in jobs:
+                results[i] = await (prefetched.get(x) or fetch(x))  # type: ignore
+
+        workers = [
+            asyncio.ensure_future(worker())
+            for _ in range(min(self._max_concurrency, len(offsets)))
+        ]
+
+        try:
+            await asyncio.gather(*workers)
+        except BaseException:
+            for task in itertools.chain(workers, prefetched.values()):
+                task.cancel()
+            raise
 
         return results
 
+    def _plan_offsets(self, url: URL, result: Mapping[str, Any]) -> range:
+        """
+        Get offsets of the remaining batches of a paginated result, and keep them as
+        a hint to prefetch batches on subsequent requests to the same URL.
+
+        :param url: URL of the first request
+        :param result: Json result of the first request
+        """
+        count = result.get("count")
+        limit = result.get("limit")
+        offset = result.get("offset", 0)
+
+        if not (count and limit):
+            self._pagination_hints.pop(url, None)
+            return range(0)
+
+        offsets = range(limit + offset, count, limit)
+
+        logger.debug(
+            "Planning %s additional requests (count: %d limit: %d offset: %d)",
+            len(offsets), count, limit, offset
+        )
+
+        self._pagination_hints[url] = offsets
+        self._pagination_hints.move_to_end(url)
+
+        if len(self._pagination_hints) > const.PAGINATION_HINTS_MAXSIZE:
+            self._pagination_hints.popitem(last=False)
+
+        return offsets
+
 
 class _ApiDocs:
     """
     Helper class containing webbrowser.open methods to open FRED documentation
-    corresponding to an ApiClient URL
+    corresponding to an ApiClient URL. webbrowser is imported on first use.
     """
+    __slots__ = ("url", "_doc_url")
 
     def __init__(self, url):
         self.url = url
+        self._doc_url = str(self._make_url())
 
     def _make_url(self) -> URL:
         subpath = self.url.path.replace("/fred", "").lstrip("/").replace("/", "_")
@@ -221,17 +449,49 @@ class _ApiDocs:
         return URL(const.FRED_DOC_URL) / subpath  # type: ignore
 
     def open(self) -> bool:
-        return webbrowser.open(str(self._make_url()))
+        """
+        Open the documentation using the default browser. See webbrowser.open
+        """
+        import webbrowser
+
+        return webbrowser.open(self._doc_url)
 
     def open_new(self) -> bool:
-        return webbrowser.open_new(str(self._make_url()))
+        """
+        Open the documentation in a new browser window. See webbrowser.open_new
+        """
+        import webbrowser
+
+        return webbrowser.open_new(self._doc_url)
 
     def open_new_tab(self) -> bool:
-        return webbrowser.open_new_tab(str(self._make_url()))
+        """
+        Open the documentation in a new browser tab. See webbrowser.open_new_tab
+        """
+        import webbrowser
+
+        return webbrowser.open_new_tab(self._doc_url)
+
+    async def _run_in_executor(self, fn: Callable[[], bool]) -> bool:
+        return await asyncio.get_event_loop().run_in_executor(None, fn)
+
+    async def aopen(self) -> bool:
+        """
+        Coroutine version of open(), which does not block the event loop
+        """
+        return await self._run_in_executor(self.open)
+
+    async def aopen_new(self) -> bool:
+        """
+        Coroutine version of open_new(), which does not block the event loop
+        """
+        return await self._run_in_executor(self.open_new)
 
-    open.__doc__ = webbrowser.open.__doc__
-    open_new.__doc__ = webbrowser.open_new.__doc__
-    open_new_tab.__doc__ = webbrowser.open_new_tab.__doc__
+    async def aopen_new_tab(self) -> bool:
+        """
+        Coroutine version of open_new_tab(), which does not block the event loop
+        """
+        return await self._run_in_executor(self.open_new_tab)
 
 
 class Endpoint(object):
@@ -239,6 +499,10 @@ class Endpoint(object):
     Combines the high-level API client with endpoint URLs, URL encoding logic,
     and getter methods.
     """
+    # __dict__ holds the Endpoint attributes of subpaths
+    __slots__ = (
+        "client", "path", "_suburl", "_cached_url", "_cached_defaults", "_docs", "__dict__"
+    )
 
     base_url: URL = URL(const.FRED_API_URL, encoded=True)
 
@@ -246,40 +510,104 @@ class Endpoint(object):
         self.client = client
         self.path = path
 
+        # Encoded URL is cached along with the client defaults it was built from
+        self._suburl: URL = self.base_url / path
+        self._cached_url: Optional[URL] = None
+        self._cached_defaults: Optional[Mapping[str, str]] = None
+        self._docs: Optional[_ApiDocs] = None
+
+    def __getattr__(self, name: str) -> "Endpoint":
+        """
+        Create Endpoint attributes of subpaths on first access
+        """
+        if name.startswith("_") or name in Endpoint.__slots__:
+            raise AttributeError(name)
+        return _add_endpoint(self, self.client, self.path, name)
+
+    def __dir__(self):
+        return sorted(set(super().__dir__()) | _endpoint_tree.get(self.path, {}).keys())
+
     @property
     def docs(self) -> _ApiDocs:
-        return _ApiDocs(self.url)
+        if self._docs is None:
+            self._docs = _ApiDocs(self.url)
+        return self._docs
 
     @property
     def url(self) -> URL:
         """
-        Encode this client's URL with client default query parameters
+        Encode this client's URL with client default query parameters.
+        The result is cached until the client defaults change.
         """
-        suburl = self.base_url / self.path
-        return suburl.with_query(**dict(self.client.defaults))  # type: ignore
+        defaults = self.client.defaults
+
+        if self._cached_url is None or defaults is not self._cached_defaults:
+            self._cached_url = self._suburl.with_query(defaults)
+            self._cached_defaults = defaults
+
+        return self._cached_url
 
     async def aget(self,
                    jsonpath: Optional[str] = None,
                    retries: int = 3,
-                   engine: utils.AbstractQueryEngine = utils.JsonpathEngine(),
+                   engine: Optional[utils.AbstractQueryEngine] = None,
+                   count: Optional[int] = None,
+                   probe: bool = False,
                    **params) -> utils.JSON_T:
         """Get request results as a list of JSON
 
         :param jsonpath: Optional jsonpath to query json results
         :param retries: Number of request retries before raising an exeption. Currently only
         applies to ClientResponseError with status 429.
-        :param engine: Query engine used to execute jsonpath query
+        :param engine: Query engine used to execute jsonpath query. Defaults to a shared
+        JsonpathEngine.
+        :param count: Optional known total result count. If passed along with a `limit`
+        parameter, all pages are requested concurrently.
+        :param probe: If True and a `limit` parameter is passed, get the result count from
+        a minimal request before requesting all pages concurrently.
         :param params: HTTP request parameters
         """
 
-        url = self.url.update_query(params)
-        res = await self.client.get(url, retries)
+        url = self.url.update_query(params) if params else self.url
+        res = await self.client.get(url, retries, count, probe)
 
         if jsonpath:
-            mapped = map(engine.compile(jsonpath).execute, res)  # type: ignore
-            return list(itertools.chain.from_iterable(mapped))  # type: ignore
+            query = (engine or _default_engine).compile(jsonpath)
+            return [value for data in res for value in query.execute(data)]  # type: ignore
         return res
 
+    async def aiter(self,
+                    jsonpath: Optional[str] = None,
+                    retries: int = 3,
+                    engine: Optional[utils.AbstractQueryEngine] = None,
+                    **params) -> AsyncIterator[utils.JSON_T]:
+        """Iterate over request results, yielding JSON for each batch as soon as it is
+        received. If a jsonpath is given, a list of query results is yielded per batch.
+
+        :param jsonpath: Optional jsonpath to query json results
+        :param retries: Number of request retries before raising an exeption. Currently only
+        applies to ClientResponseError with status 429.
+        :param engine: Query engine used to execute jsonpath query. Defaults to a shared
+        JsonpathEngine.
+        :param params: HTTP request parameters
+        """
+
+        url = self.url.update_query(params) if params else self.url
+
+        # Close the inner generator with this one so pending batches are
+        # cancelled immediately rather than on garbage collection
+        batches = self.client.iterget(url, retries)
+        try:
+            async for batch in batches:
+                if jsonpath:
+                    query = (engine or _default_engine).compile(jsonpath)
+                    values: List[Any] = list(query.execute(batch))
+                    yield values
+                else:
+                    yield batch
+        finally:
+            await batches.aclose()
+
     @utils.sharedoc(aget)
     def get(self, **kwargs) -> utils.JSON_T:
         return utils.loop.run_until_complete(self.aget(**kwargs))
@@ -288,7 +616,119 @@ class Endpoint(object):
     def get_pandas(self, **kwargs) -> "DataFrame":
         from pandas import DataFrame
 
-        return DataFrame.from_records(self.get(**kwargs))
+        records = self.get(**kwargs)
+
+        # Lists of records from each page are flattened into a single frame
+        if records and all(isinstance(r, list) for r in records):
+            records = itertools.chain.from_iterable(records)
+
+        return DataFrame.from_records(records)
+
+
+def _plan_endpoints(*endpoints: str) -> Dict[str, Dict[str, str]]:
+    """
+    Resolve the endpoint attribute tree, mapping each url subpath ("" for the
+    client) to the attribute names and subpaths of its children. Subpaths
+    colliding with an existing ApiClient or Endpoint attribute name are excluded
+    along with their children. Names are interned, as are the attribute names
+    they are looked up by.
+
+    :param endpoints: FRED API url subpaths
+    """
+    tree: Dict[str, Dict[str, str]] = {"": {}}
+
+    for ep in endpoints:
+
+        parent = ""
+        for name in map(sys.intern, ep.split("/")):
+            subpath = parent + "/" + name if parent else name
+
+            if subpath not in tree:
+                if parent not in tree or hasattr(Endpoint if parent else ApiClient, name):
+                    break
+                tree[parent][name] = subpath
+                tree[subpath] = {}
+
+            parent = subpath
+
+    return tree
+
+
+def _offset_url_template(url: URL) -> str:
+    """
+    Get a %-format template of an encoded URL, with an integer offset query parameter
+
+    :param url: URL, which may already have an offset parameter
+    """
+    query = [(k, v) for k, v in url.query.items() if k != "offset"]
+    if len(query) != len(url.query):
+        url = url.with_query(query)
+
+    sep = "&" if url.query_string else "?"
+    return str(url).replace("%", "%%") + sep + "offset=%d"
+
+
+def _add_endpoint(parent: Any, client: ApiClient, subpath: str, name: str) -> Endpoint:
+    """
+    Create an Endpoint from the endpoint tree and set it as an attribute of its parent
+
+    :param parent: ApiClient or Endpoint
+    :param client: ApiClient
+    :param subpath: Url subpath of the parent
+    :param name: Attribute name
+    """
+    try:
+        path = _endpoint_tree[subpath][name]
+    except KeyError:
+        msg = "'%s' object has no attribute '%s'" % (type(parent).__name__, name)
+        raise AttributeError(msg) from None
+
+    endpoint = Endpoint(client, path)
+    setattr(parent, name, endpoint)
+    return endpoint
+
+
+_endpoint_tree = _plan_endpoints(*const.FRED_API_ENDPOINTS)
+
+
+def get_connector() -> TCPConnector:
+    """
+    Get a TCPConnector tuned for the FRED API. Connections to the single FRED
+    host are capped at the rate limit and kept alive between requests, and
+    DNS lookups are cached.
+    """
+    return TCPConnector(
+        limit=0,
+        limit_per_host=const.FRED_API_RATE_LIMIT,
+        keepalive_timeout=const.FRED_API_KEEPALIVE_TIMEOUT,
+        ttl_dns_cache=const.FRED_API_DNS_CACHE_TTL
+    )
+
+
+def _schedule_close(session: ClientSession) -> None:
+    """
+    Schedule a session to be closed on the running loop. The task is referenced
+    until done, and any error closing the session is logged.
+
+    :param session: ClientSession
+    """
+    task = utils.loop.create_task(session.close())
+    _closing.add(task)
+    task.add_done_callback(_on_closed)
+
+
+def _on_closed(task: asyncio.Future) -> None:
+    _closing.discard(task)
+    if not task.cancelled() and task.exception() is not None:
+        logger.error("Error closing session: %s", task.exception())
+
+
+async def _wait_closed() -> None:
+    """
+    Wait for sessions scheduled to close by ApiClient.close() to finish closing
+    """
+    if _closing:
+        await asyncio.gather(*_closing, return_exceptions=True)
 
 
 def get_api_key() -> Optional[str]:
@@ -300,7 +740,9 @@ def get_api_key() -> Optional[str]:
 
 def get_client(api_key: Optional[str] = None, **session_kws) -> ApiClient:
     """
-    Wrapper around ApiClient constructor
+    Wrapper around ApiClient constructor. Clients are cached per api key, and their
+    sessions reused, unless session_kws are given in which case a new client is
+    returned. Cached clients are closed by fredio.ashutdown().
 
     :param api_key: Optional FRED API key. Retrieved from env FRED_API_KEY if not set.
     :param session_kws: Keyword arguments passed to the ClientSession constructor.
@@ -311,4 +753,14 @@ def get_client(api_key: Optional[str] = None, **session_kws) -> ApiClient:
         msg = "Api key must be provided or passed as environment variable FRED_API_KEY"
         raise ValueError(msg)
 
-    return ApiClient(api_key=api_key, **session_kws)
+    if session_kws:
+        return ApiClient(api_key=api_key, **session_kws)
+
+    if api_key not in _clients:
+        _clients[api_key] = ApiClient(api_key=api_key)
+
+    return _clients[api_key]
+
+
+_clients: Dict[str, ApiClient] = {}
+_closing: Set[asyncio.Future] = set()
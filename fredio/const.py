@@ -43,6 +43,12 @@ FRED_DOC_URL = "https://fred.stlouisfed.org/docs/api/fred"
 
 FRED_API_RATE_LIMIT = 120
 FRED_API_RATE_RESET = 60
+FRED_API_MAX_CONCURRENCY = 64
+FRED_API_KEEPALIVE_TIMEOUT = 75
+FRED_API_DNS_CACHE_TTL = 300
 FRED_API_FILE_TYPE = "json"  # other XML option but we dont want that
 
+PAGINATION_HINTS_MAXSIZE = 256
+JSON_EXECUTOR_MINSIZE = 1 << 20  # decode larger response bodies off the event loop
+
 HEADER_DATE_FMT = "%a, %d %b %Y %H:%M:%S GMT"
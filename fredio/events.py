@@ -5,7 +5,7 @@ __all__ = [
 
 import asyncio
 import logging
-from typing import Any, Awaitable, Callable, Dict, List, Optional, Union
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple, Union
 
 from . import utils
 
@@ -19,11 +19,12 @@ _task: Optional[asyncio.Task] = None
 
 
 class Event(object):
+    __slots__ = ("name", "_handlers", "_frozen")
 
     def __init__(self, name: str):
         self.name = name
 
-        self._handlers: List[Callable] = []
+        self._handlers: Tuple[Callable, ...] = ()
         self._frozen = False
 
     def add(self, handler: Callable) -> None:
@@ -36,9 +37,8 @@ class Event(object):
         if self._frozen:
             raise RuntimeError("Cannot modify frozen event")
 
-        self._handlers.append(utils.coroutine(handler))
-        logger.info("Registered handler '%s' for event '%s'"
-                    % (handler.__name__, self.name))
+        self._handlers += (utils.coroutine(handler),)
+        logger.info("Registered handler '%s' for event '%s'", handler.__name__, self.name)
 
     def freeze(self):
         self._frozen = True
@@ -47,7 +47,7 @@ class Event(object):
         """
         Call all event handlers for this event.
         """
-        logger.debug("Received event '%s'" % self.name)
+        logger.debug("Received event '%s'", self.name)
 
         try:
             for handler in self._handlers:
@@ -69,15 +69,27 @@ async def produce(name: str, data: Any, q: asyncio.Queue = queue) -> None:
 
 async def consume(q: asyncio.Queue = queue) -> None:
     """
-    Consume an event from the queue, and create a Task to call all
-    handlers for this event. A callback is added to the Task to indicate
+    Consume events from the queue, and create a Task to call all
+    handlers for each event. A callback is added to each Task to indicate
     completion to the queue such that queue.join() can eventually unblock
     once called.
 
+    Waits for a single event, then drains any other events already on the
+    queue without yielding to the event loop.
+
     :param q: queue
     """
-    name, event = await q.get()
+    item = await q.get()
+
+    while True:
+        _dispatch(q, *item)
+        try:
+            item = q.get_nowait()
+        except asyncio.QueueEmpty:
+            break
+
 
+def _dispatch(q: asyncio.Queue, name: str, event: Any) -> None:
     if name in _events:
         coro = _events[name].apply(event)
         task = utils.loop.create_task(coro)
@@ -106,7 +118,7 @@ async def cancel(timeout: Optional[Union[float, int]] = None) -> None:
 
     if running():
         try:
-            logger.debug("Flushing %d remaining tasks" % queue.qsize())
+            logger.debug("Flushing %d remaining tasks", queue.qsize())
 
             await flush(timeout)
         except asyncio.TimeoutError as e:
@@ -131,7 +143,7 @@ def listen() -> bool:
         for ev in _events.values():
             ev.freeze()
 
-        logger.debug("Listening for events: \n%s" % "\n".join(_events.keys()))
+        logger.debug("Listening for events: \n%s", "\n".join(_events.keys()))
         _task = utils.loop.create_task(_listen())
 
     return True
@@ -18,6 +18,8 @@ class Timer(abc.ABC):
     """
     Abstract timer class
     """
+    __slots__ = ()
+
     @abc.abstractmethod
     def time(self) -> float: ...
 
@@ -26,6 +28,8 @@ class SystemTimer(Timer):
     """
     System timer. Wraps time.time()
     """
+    __slots__ = ()
+
     def time(self):
         return time.time()
 
@@ -38,6 +42,8 @@ class MonotonicTimer(Timer):
     This offset is used to define a point of reference such that it behaves
     similarly to system time but is not affected by clock synchronization.
     """
+    __slots__ = ("_deltat",)
+
     def __init__(self):
         self._deltat = time.time() - time.monotonic()
 
@@ -56,9 +62,11 @@ class AsyncLock(Protocol):
 
 class RateLimiter(object):
     """
-    Rate-limiting implementation using a BoundedSemaphore.
-    Locks are released after the current period has passed.
+    Rolling-window rate-limiting implementation using a BoundedSemaphore.
+    Each lock is released one full period after it is returned, so no more
+    than `limit` locks are held within any window of `period` seconds.
     """
+    __slots__ = ("_lock", "_period", "_timer", "_now")
 
     def __init__(self,
                  limit: int = const.FRED_API_RATE_LIMIT,
@@ -71,6 +79,7 @@ class RateLimiter(object):
         self._lock = lock or asyncio.BoundedSemaphore(limit, loop=loop)
         self._period = period
         self._timer = timer
+        self._now = timer.time
 
     async def acquire(self) -> None:
         """
@@ -80,18 +89,16 @@ class RateLimiter(object):
 
     def release(self) -> None:
         """
-        Schedule a lock to be released in the next counter
+        Schedule a lock to be released after one period, using a timer
+        on the running event loop
         """
-        ts, ct = self._timer.time(), self.get_counter()
-
-        def done_cb(_):
-            logger.debug("Released lock from counter %d (elapsed %.4f)"
-                         % (ct, self._timer.time() - ts))
-            self._lock.release()
+        ts = self._now() if logger.isEnabledFor(logging.DEBUG) else None
+        asyncio.get_event_loop().call_later(self._period, self._release, ts)
 
-        backoff = self.get_backoff(False)
-        sleeper: asyncio.Future = asyncio.ensure_future(asyncio.sleep(backoff))
-        sleeper.add_done_callback(done_cb)
+    def _release(self, ts: Optional[float]) -> None:
+        if ts is not None:
+            logger.debug("Released lock (elapsed %.4f)", self._now() - ts)
+        self._lock.release()
 
     async def __aenter__(self) -> None:
         await self.acquire()
@@ -106,7 +113,7 @@ class RateLimiter(object):
         :param ceil: Round backoff time up to the closest second
         :param reltime: Relative time
         """
-        reltime = reltime or self._timer.time()
+        reltime = reltime or self._now()
         backoff = self._period - reltime % self._period
 
         if ceil:
@@ -117,4 +124,4 @@ class RateLimiter(object):
         """
         Get number of periods since timer start
         """
-        return int(self._timer.time() // self._period)
+        return int(self._now() // self._period)
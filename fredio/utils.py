@@ -1,10 +1,12 @@
-__all__ = ["get_all_tasks", "AbstractQueryEngine", "JsonpathEngine"]
+__all__ = ["get_all_tasks", "use_fast_loop", "json_loads", "AbstractQueryEngine", "JsonpathEngine"]
 
 import abc
 import asyncio
+import collections
 import functools
 import inspect
 import logging
+import os
 import re
 import sys
 from typing import (Any,
@@ -15,16 +17,45 @@ from typing import (Any,
                     List,
                     Mapping,
                     Set,
+                    Tuple,
+                    Type,
                     Union)
 
 from jsonpath_rw import parse
 
+json_loads: Callable[..., Any]
+
+try:
+    from orjson import loads as json_loads
+except ImportError:  # pragma: no-cover
+    from json import loads as json_loads
+
 
 JSON_T = Union[List[Mapping[str, Any]], Mapping[str, Any]]
 
 
 logger = logging.getLogger(__name__)
 
+
+def use_fast_loop() -> bool:
+    """
+    Install the uvloop event loop policy, if uvloop is available. This only
+    affects event loops created afterwards, so the main loop will use uvloop
+    if environment variable FREDIO_FAST_LOOP is set when fredio is imported.
+    """
+    try:
+        import uvloop
+    except ImportError:
+        logger.debug("uvloop is not installed")
+        return False
+
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    return True
+
+
+if os.environ.get("FREDIO_FAST_LOOP"):
+    use_fast_loop()
+
 # Main event loop
 loop = asyncio.get_event_loop()
 
@@ -41,12 +72,18 @@ def get_all_tasks() -> Set[asyncio.Task]:
 
 def cancel_running_tasks() -> None:
     """
-    Cancel all running tasks in this loop
+    Cancel all running tasks in this loop. If the loop is not running, block
+    until all tasks have finished cancelling.
     """
-    for task in get_all_tasks():
-        if not task.done():
-            logger.debug("Cancelling task %s" % task)
-            task.cancel()
+    tasks = [task for task in get_all_tasks() if not task.done()]
+
+    for task in tasks:
+        task.cancel()
+
+    logger.debug("Cancelled %d tasks", len(tasks))
+
+    if tasks and not loop.is_running():
+        loop.run_until_complete(asyncio.gather(*tasks, return_exceptions=True))
 
 
 def coroutine(fn: Callable) -> Callable[..., Awaitable]:
@@ -82,14 +119,43 @@ def sharedoc(orig, short=None):
     return wrapped
 
 
+# Process-wide LRU cache of compiled queries, keyed by engine class and query string
+_compiled_queries: "collections.OrderedDict[Tuple[Type, str], Any]" = collections.OrderedDict()
+_compiled_queries_maxsize = 256
+
+
+def _compile_query(engine: "AbstractQueryEngine", query: str) -> Any:
+    """
+    Get a compiled query from the cache, compiling it with the given engine on a miss
+
+    :param engine: Query engine
+    :param query: Json query
+    """
+    key = (type(engine), query)
+
+    try:
+        compiled = _compiled_queries[key]
+    except KeyError:
+        compiled = _compiled_queries[key] = engine._compile(query)
+
+        if len(_compiled_queries) > _compiled_queries_maxsize:
+            _compiled_queries.popitem(last=False)
+    else:
+        _compiled_queries.move_to_end(key)
+
+    return compiled
+
+
 class AbstractQueryEngine(abc.ABC):
     """
     Abstract class to wrap core parsing & execution methods of
-    json processing libraries
+    json processing libraries.
+
+    Compiled queries are cached per engine class, so _compile should not
+    depend on instance state.
     """
 
     def __init__(self):
-        self._cache = {}
         self._compiled = None
 
     @abc.abstractmethod
@@ -104,7 +170,7 @@ class AbstractQueryEngine(abc.ABC):
 
         :param query: Json query
         """
-        self._compiled = self._cache.setdefault(query, self._compile(query))
+        self._compiled = _compile_query(self, query)
         return self
 
     def execute(self, data: JSON_T) -> Generator[JSON_T, None, None]:
@@ -117,12 +183,35 @@ class AbstractQueryEngine(abc.ABC):
         yield from self._execute(data)
 
 
+# Matches jsonpath queries selecting all items of a single key e.g. $.observations[*]
+_select_all_re = re.compile(r"^(?:\$\.)?(\w+)\[\*\]$")
+
+
+def _select_all(key: str, data: JSON_T) -> List[Any]:
+    """
+    Equivalent to the jsonpath query `key[*]`
+    """
+    try:
+        value = data[key]  # type: ignore
+    except (KeyError, TypeError):
+        return []
+    return value if isinstance(value, list) else [value]
+
+
+def _find_values(parsed: Any, data: JSON_T) -> List[Any]:
+    return [i.value for i in parsed.find(data)]
+
+
 class JsonpathEngine(AbstractQueryEngine):
     """
-    Wraps jsonpath_rw library
+    Wraps jsonpath_rw library. Queries selecting all items of a single key,
+    e.g. `observations[*]`, are executed directly without jsonpath_rw.
     """
     def _compile(self, query: str):
-        return parse(query)
+        match = _select_all_re.match(query)
+        if match is not None:
+            return functools.partial(_select_all, match.group(1))
+        return functools.partial(_find_values, parse(query))
 
     def _execute(self, data: JSON_T):
-        return [i.value for i in self._compiled.find(data)]
+        return self._compiled(data)
@@ -37,5 +37,9 @@ setup(
         "yarl>=1.0,<2.0",
         "typing_extensions"
     ],
+    extras_require={
+        "orjson": ["orjson"],
+        "uvloop": ["uvloop"]
+    },
     test_suite="tests"
 )
@@ -8,12 +8,14 @@ from unittest.mock import MagicMock
 from unittest.mock import patch
 
 from aiohttp import ClientResponse, ClientResponseError
+from aiohttp.client import _RequestContextManager
 from pandas import DataFrame
 from yarl import URL
 
-from fredio import configure
+from fredio import configure, shutdown
 from fredio import const, locks, utils
 from fredio.client import ApiClient, Endpoint, get_client  # noqa
+from fredio.client import _offset_url_template, _wait_closed
 
 from tests import async_test
 
@@ -81,6 +83,7 @@ class TestApiClient(unittest.TestCase):
 
     def tearDown(self) -> None:
         self.client.close()
+        self.client._pagination_hints.clear()
 
         # Reset the RL
         for task in utils.get_all_tasks():
@@ -139,6 +142,35 @@ class TestApiClient(unittest.TestCase):
         # JIC
         await sleeper
 
+    def test_request_retry_after(self):
+        exc = ClientResponseError(MagicMock(), (), status=429)
+        response = MagicMock(headers={"Retry-After": "5"})
+
+        self.assertEqual(5.0, self.client._get_retry_backoff(response, exc))
+
+    @async_test
+    async def test_request_retry_sleep_released(self):
+
+        # Backoff before a retry should not hold the semaphore or the response
+        states = []
+        exited = []
+        aexit = _RequestContextManager.__aexit__
+
+        async def sleep(delay):
+            states.append((self.client.semaphore._value, len(exited)))
+
+        async def request_exit(ctx, *args):
+            exited.append(ctx)
+            return await aexit(ctx, *args)
+
+        with patch("asyncio.sleep", side_effect=sleep), \
+                patch.object(_RequestContextManager, "__aexit__", request_exit):
+            with self.patchedRequest(status=429):
+                with self.assertRaises(ClientResponseError):
+                    await self.client.request("GET", self.request_url, retries=1)
+
+        self.assertEqual([(self.client._max_concurrency, 1)], states)
+
     @async_test
     async def test_get(self):
 
@@ -154,6 +186,144 @@ class TestApiClient(unittest.TestCase):
             await self.endpoint.aget()
             self.assertEqual(2, req.call_count)
 
+    def test_url_cached(self):
+        url = self.endpoint.url
+
+        self.assertDictEqual({"api_key": "foo", "file_type": "json"}, dict(url.query))
+        self.assertIs(url, self.endpoint.url)
+
+    @async_test
+    async def test_aiter(self):
+        response = mock_fred_response("GET", self.request_url, count=3, limit=1)
+
+        with self.patchedRequest(return_value=response) as req:
+            batches = [batch async for batch in self.endpoint.aiter(jsonpath="count")]
+
+            self.assertEqual(3, req.call_count)
+            self.assertListEqual([[3], [3], [3]], batches)
+
+    def yieldingRequest(self, count: int = 0, limit: int = 0, fail_offset: int = -1):
+        """
+        Patch requests with a side effect yielding to the event loop, returning a
+        400 response for the batch at fail_offset
+        """
+        def mock_response(status):
+            response = mock_fred_response("GET", self.request_url, status, count, limit)
+            if isinstance(response, asyncio.Future):
+                response = response.result()
+            return response
+
+        ok, failed = mock_response(200), mock_response(400)
+
+        async def request(method, url, **kwargs):
+            await asyncio.sleep(0)
+            return failed if ("offset=%d" % fail_offset) in str(url) else ok
+
+        return patch("aiohttp.ClientSession._request", side_effect=request)
+
+    @async_test
+    async def test_aiter_close(self):
+        client = ApiClient("foo", max_concurrency=1)
+        client.ratelimiter = locks.RateLimiter(limit=100)
+        endpoint = Endpoint(client=client, path="")
+
+        with self.yieldingRequest(count=20, limit=1) as req:
+            batches = endpoint.aiter()
+            await batches.__anext__()
+            await batches.__anext__()
+            await batches.aclose()
+            calls = req.call_count
+
+            # Remaining batches should not be requested once the generator is closed
+            for _ in range(10):
+                await asyncio.sleep(0)
+            self.assertEqual(calls, req.call_count)
+            self.assertLess(calls, 20)
+
+        await client.aclose()
+
+    @async_test
+    async def test_aiter_error(self):
+
+        with self.yieldingRequest(count=3, limit=1, fail_offset=2):
+            with self.assertRaises(ClientResponseError):
+                async for _ in self.endpoint.aiter():
+                    pass
+
+    @async_test
+    async def test_get_paginated_prefetch(self):
+        response = mock_fred_response("GET", self.request_url, count=3, limit=1)
+
+        with self.patchedRequest(return_value=response) as req:
+            await self.endpoint.aget()
+            self.assertEqual(3, req.call_count)
+            self.assertEqual(range(1, 3), self.client._pagination_hints[self.endpoint.url])
+
+            ret = await self.endpoint.aget()
+            self.assertEqual(6, req.call_count)
+            self.assertEqual(3, len(ret))
+
+    @async_test
+    async def test_get_paginated_count(self):
+        response = mock_fred_response("GET", self.request_url, count=2, limit=1)
+
+        with self.patchedRequest(return_value=response) as req:
+            ret = await self.endpoint.aget(count=3, limit=1)
+            self.assertEqual(3, req.call_count)
+            self.assertEqual(3, len(ret))
+
+    @async_test
+    async def test_get_paginated_prefetch_bounded(self):
+        client = ApiClient("foo", max_concurrency=4)
+        client.ratelimiter = locks.RateLimiter(limit=100)
+
+        endpoint = Endpoint(client=client, path="")
+        response = mock_fred_response("GET", self.request_url, count=50, limit=1)
+
+        baseline = len(utils.get_all_tasks())
+        peak = 0
+
+        def request(*args, **kwargs):
+            nonlocal peak
+            peak = max(peak, len(utils.get_all_tasks()) - baseline)
+            return response
+
+        # The second request prefetches from the pagination hint of the first
+        with self.patchedRequest(side_effect=request):
+            for _ in range(2):
+                ret = await endpoint.aget(limit=1)
+                self.assertEqual(50, len(ret))
+
+        # The first batch, speculative batches, and workers
+        self.assertLessEqual(peak, 1 + 4 + 4)
+        await client.aclose()
+
+    @async_test
+    async def test_get_paginated_probe(self):
+        response = mock_fred_response("GET", self.request_url, count=3, limit=1)
+
+        with self.patchedRequest(return_value=response) as req:
+            ret = await self.endpoint.aget(probe=True, limit=1)
+            self.assertEqual(4, req.call_count)
+            self.assertEqual(3, len(ret))
+
+    @async_test
+    async def test_get_decode_in_executor(self):
+        loop = asyncio.get_event_loop()
+
+        # Small bodies are decoded inline, and bodies of at least the minimum size
+        # are decoded in the executor
+        for minsize, offloaded in ((const.JSON_EXECUTOR_MINSIZE, False), (0, True)):
+            with self.patchedRequest(), \
+                    patch.object(const, "JSON_EXECUTOR_MINSIZE", minsize), \
+                    patch.object(loop, "run_in_executor", wraps=loop.run_in_executor) as spy:
+                ret = await self.endpoint.aget()
+
+            self.assertEqual(1, len(ret))
+            self.assertEqual(offloaded, spy.called)
+            if offloaded:
+                self.assertIs(utils.json_loads, spy.call_args[0][1])
+
     @async_test
     async def test_get_jsonpath(self):
 
@@ -162,6 +332,31 @@ class TestApiClient(unittest.TestCase):
             self.assertEqual(ret, [0])
             req.assert_called_once()
 
+    @async_test
+    async def test_get_jsonpath_select_all(self):
+
+        with self.patchedRequest():
+            self.assertEqual(await self.endpoint.aget(jsonpath="$.count[*]"), [0])
+            self.assertEqual(await self.endpoint.aget(jsonpath="missing[*]"), [])
+
+    @async_test
+    async def test_get_engine_with_args(self):
+
+        class KeyEngine(utils.AbstractQueryEngine):
+            def __init__(self, default):
+                super().__init__()
+                self.default = default
+
+            def _compile(self, query):
+                return query
+
+            def _execute(self, data):
+                return [data.get(self._compiled, self.default)]
+
+        with self.patchedRequest():
+            ret = await self.endpoint.aget(jsonpath="missing", engine=KeyEngine(-1))
+            self.assertEqual(ret, [-1])
+
     def test_client_getters(self):
 
         async def getter(*args, **kwargs):
@@ -192,6 +387,41 @@ class TestApiClient(unittest.TestCase):
             for _, kwarg in pat.call_args_list:
                 self.assertDictEqual({"series_id": "EFFR"}, kwarg)
 
+    def test_get_pandas_flattens_pages(self):
+        pages = [[{"value": 1}, {"value": 2}], [{"value": 3}]]
+
+        with patch.object(Endpoint, "get", return_value=pages):
+            df = self.endpoint.get_pandas()
+
+        self.assertListEqual([1, 2, 3], df["value"].tolist())
+
+    @async_test
+    async def test_close_running_loop(self):
+        self.client.start()
+        session = self.client._session
+
+        # Closing is scheduled on the running loop, and shutdown is a no-op
+        self.client.close()
+        shutdown()
+        self.assertIsNone(self.client._session)
+
+        await _wait_closed()
+        self.assertTrue(session.closed)  # type: ignore
+
+    def test_close_closed_loop(self):
+        self.client.start()
+        session = self.client._session
+
+        loop = asyncio.new_event_loop()
+        loop.close()
+
+        with patch.object(utils, "loop", loop):
+            self.client.close()
+            shutdown()
+
+        self.assertIsNone(self.client._session)
+        utils.loop.run_until_complete(session.close())  # type: ignore
+
     def test_client_docs(self):
         docurl = "https://fred.stlouisfed.org/docs/api/fred/series.html"
 
@@ -204,6 +434,91 @@ class TestApiClient(unittest.TestCase):
         for url, *typ in pat.call_args_list:
             self.assertEqual(url[0], docurl)
 
+    @async_test
+    async def test_client_docs_async(self):
+        docurl = "https://fred.stlouisfed.org/docs/api/fred/series.html"
+
+        with patch("webbrowser.open", return_value=True) as pat:
+            self.assertTrue(await self.client.series.docs.aopen())
+
+        pat.assert_called_once_with(docurl)
+
+
+class GetClientTest(unittest.TestCase):
+
+    def test_get_client_cached(self):
+        client = get_client(api_key="foo")
+
+        self.assertIs(client, get_client(api_key="foo"))
+        self.assertIsNot(client, get_client(api_key="bar"))
+        self.assertIsNot(client, get_client(api_key="foo", trust_env=True))
+        self.assertIs(client, get_client(api_key="foo"))
+
+    @async_test
+    async def test_get_client_inflight(self):
+        client = get_client(api_key="foo")
+        session = client.session
+        url = URL("https://api.stlouisfed.org/fred/?file_type=json&api_key=foo")
+
+        response = mock_fred_response("GET", url)
+        if isinstance(response, asyncio.Future):
+            response = response.result()
+
+        started = asyncio.Event()
+        released = asyncio.Event()
+
+        async def request(*args, **kwargs):
+            started.set()
+            await released.wait()
+            return response
+
+        # Later calls should not close the session of a client already handed out
+        with patch("aiohttp.ClientSession._request", side_effect=request):
+            task = asyncio.ensure_future(client.request("GET", url))
+            await started.wait()
+
+            get_client(api_key="bar")
+            get_client(api_key="foo", trust_env=True)
+
+            released.set()
+            self.assertEqual(200, (await task).status)
+
+        await _wait_closed()
+        self.assertIs(session, client.session)
+        self.assertFalse(session.closed)
+        await client.aclose()
+
+
+class OffsetUrlTemplateTest(unittest.TestCase):
+
+    url = URL("https://api.stlouisfed.org/fred/series/search")
+
+    def assertOffsetQuery(self, url: URL, expected: dict):
+        template = _offset_url_template(url)
+        self.assertDictEqual(expected, dict(URL(template % 5, encoded=True).query))
+
+    def test_separator(self):
+        self.assertTrue(_offset_url_template(self.url).endswith("/search?offset=%d"))
+        self.assertOffsetQuery(self.url, {"offset": "5"})
+
+        url = self.url.with_query(api_key="foo")
+        self.assertTrue(_offset_url_template(url).endswith("?api_key=foo&offset=%d"))
+        self.assertOffsetQuery(url, {"api_key": "foo", "offset": "5"})
+
+    def test_existing_offset(self):
+        self.assertOffsetQuery(self.url.with_query(offset=10), {"offset": "5"})
+        self.assertOffsetQuery(
+            self.url.with_query(api_key="foo", offset=10, limit=2),
+            {"api_key": "foo", "limit": "2", "offset": "5"}
+        )
+
+    def test_percent_encoded(self):
+        for text in ("100%", "a b", "caf\u00e9", "%d"):
+            self.assertOffsetQuery(
+                self.url.with_query(search_text=text),
+                {"search_text": text, "offset": "5"}
+            )
+
 
 class ClientEndpointAttrTest(unittest.TestCase):
 
@@ -43,6 +43,15 @@ class TestEvents(unittest.TestCase):
         self.event.add(lambda x: x)
         self.assertEqual(len(self.event._handlers), 1)
 
+    def test_event_freeze(self):
+        event = events.Event("bar")
+        event.add(lambda x: x)
+        event.freeze()
+
+        with self.assertRaises(RuntimeError):
+            event.add(lambda x: x)
+        self.assertEqual(len(event._handlers), 1)
+
     def test_event_apply(self):
         _sentinel = sentinel()
 
@@ -74,6 +83,20 @@ class TestEvents(unittest.TestCase):
         self.loop.run_until_complete(runtest(_sentinel))
         self.assertEqual(_sentinel.hits, 1)
 
+    def test_consume_batch(self):
+        async def runtest(_sentinel):
+            queue = asyncio.Queue()
+            events.register("foo", lambda x: _sentinel.touch())
+
+            for _ in range(3):
+                await queue.put(("foo", "bar"))
+            await events.consume(queue)
+            await queue.join()
+
+        _sentinel = sentinel()
+        self.loop.run_until_complete(runtest(_sentinel))
+        self.assertEqual(_sentinel.hits, 3)
+
     def test_register(self):
         events.register("foo", lambda x: x)
         self.assertEvent("foo")
@@ -52,6 +52,28 @@ class _TestBase:
 
         self.assertEqual(self.ratelimiter._lock._value, self.rate)
 
+    @async_test
+    async def test_release_rolling_window(self):
+
+        # Test that a lock returned partway through a period is held over the
+        # next period boundary, and released one full period after it was returned
+
+        # Start just after a period boundary
+        await asyncio.sleep(self.ratelimiter.get_backoff(ceil=False))
+
+        async with self.ratelimiter:
+            await asyncio.sleep(self.period / 2)
+        released = self.loop.time()
+
+        # A fixed window would have released the lock at the next boundary
+        await asyncio.sleep(self.ratelimiter.get_backoff(ceil=False) + self.period / 10)
+        self.assertEqual(self.ratelimiter._lock._value, self.rate - 1)
+
+        # Lock should be released a full period after it was returned
+        await asyncio.sleep(released + self.period - self.loop.time())
+        await asyncio.sleep(0)
+        self.assertEqual(self.ratelimiter._lock._value, self.rate)
+
 
 class TestSystemRateLimiting(_TestBase, unittest.TestCase):
     timer = locks.SystemTimer()